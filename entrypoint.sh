@@ -3,11 +3,11 @@ set -e
 
 echo "🚀 Starting Legal Consultation Backend..."
 
-# Wait a moment for any dependencies
-sleep 2
-
-echo "📦 Running database migrations..."
-python manage.py migrate --noinput
+# Compose only starts us once the database is healthy; scale-outs can skip this
+if [ "${RUN_MIGRATIONS:-True}" = "True" ]; then
+    echo "📦 Running database migrations..."
+    python manage.py migrate --noinput
+fi
 
 echo "👤 Checking for superuser..."
 # Create superuser if it doesn't exist (optional)
@@ -15,12 +15,6 @@ echo "👤 Checking for superuser..."
 
 echo "✅ Setup complete! Starting Gunicorn..."
 
-# Start Gunicorn
+# Start Gunicorn (workers, threads and preload are in settings/gunicorn.conf.py)
 exec gunicorn settings.wsgi:application \
-    --bind 0.0.0.0:8000 \
-    --workers 2 \
-    --threads 4 \
-    --timeout 60 \
-    --access-logfile - \
-    --error-logfile - \
-    --log-level info
\ No newline at end of file
+    --config settings/gunicorn.conf.py
@@ -0,0 +1,133 @@
+import gzip
+import json
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ConsultationRequest, ServiceType
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = ['id', 'name', 'email', 'phone', 'service_type', 'comment', 'created_at']
+ARCHIVE_FILE_TEMPLATE = 'consultations-{year:04d}-{month:02d}.ndjson.gz'
+
+
+class ConsultationArchiveService:
+    """
+    Moves old consultation requests out of the hot table into monthly
+    gzip NDJSON files and reads them back on demand
+    """
+
+    @staticmethod
+    def archive_dir():
+        return Path(settings.CONSULTATION_ARCHIVE_DIR)
+
+    @staticmethod
+    def archive_path(year, month):
+        return ConsultationArchiveService.archive_dir() / ARCHIVE_FILE_TEMPLATE.format(year=year, month=month)
+
+    @staticmethod
+    def cutoff(older_than_days=None):
+        if older_than_days is None:
+            older_than_days = settings.CONSULTATION_RETENTION_DAYS
+        return timezone.now() - timedelta(days=older_than_days)
+
+    @staticmethod
+    def archive_chunk(cutoff, chunk_size):
+        """
+        Archive and delete one chunk of rows created before `cutoff`.
+
+        Rows are appended to the archive (as a new gzip member, fsynced)
+        before they are deleted, so a crash can at worst leave a row in
+        both places; the read path de-duplicates by id.
+        Returns the number of rows moved.
+        """
+        rows = list(
+            ConsultationRequest.objects
+            .filter(created_at__lt=cutoff)
+            .order_by('id')
+            .values(*ARCHIVE_FIELDS)[:chunk_size]
+        )
+        if not rows:
+            return 0
+
+        by_month = {}
+        for row in rows:
+            created_at = row['created_at']
+            by_month.setdefault((created_at.year, created_at.month), []).append(row)
+
+        ConsultationArchiveService.archive_dir().mkdir(parents=True, exist_ok=True)
+        for (year, month), month_rows in by_month.items():
+            path = ConsultationArchiveService.archive_path(year, month)
+            with open(path, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as archive:
+                    for row in month_rows:
+                        line = json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+                        archive.write(line.encode('utf-8') + b'\n')
+                raw.flush()
+                os.fsync(raw.fileno())
+
+        # Short transaction per chunk keeps row locks brief
+        with transaction.atomic():
+            ConsultationRequest.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+        logger.info(f"🗄️ Archived {len(rows)} consultation(s) into {len(by_month)} monthly file(s)")
+        return len(rows)
+
+    @staticmethod
+    def iter_archived(start=None, end=None, service_type=None, search=None):
+        """
+        Yield archived consultations (dicts) created in [start, end),
+        optionally filtered by service type and a case-insensitive
+        substring match on name, email, phone or comment
+        """
+        search = search.lower() if search else None
+        labels = dict(ServiceType.choices)
+        seen = set()
+
+        archive_dir = ConsultationArchiveService.archive_dir()
+        if not archive_dir.is_dir():
+            return
+
+        for path in sorted(archive_dir.glob('consultations-*.ndjson.gz'), reverse=True):
+            if not ConsultationArchiveService._file_in_range(path, start, end):
+                continue
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                for line in archive:
+                    row = json.loads(line)
+                    if row['id'] in seen:
+                        continue
+                    seen.add(row['id'])
+
+                    created_at = parse_datetime(row['created_at'])
+                    if start and created_at < start:
+                        continue
+                    if end and created_at >= end:
+                        continue
+                    if service_type and row['service_type'] != service_type:
+                        continue
+                    if search and not any(
+                        search in (row[field] or '').lower()
+                        for field in ('name', 'email', 'phone', 'comment')
+                    ):
+                        continue
+
+                    row['service_type_display'] = labels.get(row['service_type'], row['service_type'])
+                    yield row
+
+    @staticmethod
+    def _file_in_range(path, start, end):
+        # consultations-YYYY-MM.ndjson.gz -> (YYYY, MM)
+        year, month = (int(part) for part in path.name.split('.')[0].split('-')[1:3])
+        if start and (year, month) < (start.year, start.month):
+            return False
+        if end and (year, month) > (end.year, end.month):
+            return False
+        return True
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from legal_form.archive import ConsultationArchiveService
+from legal_form.models import ConsultationRequest
+
+
+class Command(BaseCommand):
+    help = 'Move old consultation requests into compressed monthly archive files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=settings.CONSULTATION_RETENTION_DAYS,
+            help='Archive requests older than this many days',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.CONSULTATION_ARCHIVE_CHUNK_SIZE,
+            help='Rows moved per transaction',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Seconds to pause between chunks',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many rows would be archived',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if options['older_than_days'] < 0:
+            raise CommandError('--older-than-days must not be negative')
+
+        cutoff = ConsultationArchiveService.cutoff(options['older_than_days'])
+
+        if options['dry_run']:
+            count = ConsultationRequest.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"{count} consultation(s) older than {cutoff:%Y-%m-%d %H:%M:%S} would be archived")
+            return
+
+        total = 0
+        while True:
+            moved = ConsultationArchiveService.archive_chunk(cutoff, options['chunk_size'])
+            if not moved:
+                break
+            total += moved
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} consultation(s)"))
@@ -0,0 +1,82 @@
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# ManifestStaticFilesStorage inserts a 12 hex digit hash before the extension
+HASHED_NAME_PATTERN = r'\.[0-9a-f]{12}(\.[^/.]+)?$'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=315360000, immutable'
+
+NGINX_TEMPLATE = """# Generated by `manage.py export_static_nginx` from {manifest}
+# Include inside the server block.
+
+location ^~ {static_url} {{
+    alias {static_root}/;
+    gzip_static on;
+{brotli}    add_header Cache-Control "public, max-age={max_age}";
+    add_header Vary Accept-Encoding;
+    access_log off;
+
+    # Hashed names from the manifest never change
+    location ~ "{hashed_name_pattern}" {{
+        add_header Cache-Control "{immutable_cache_control}";
+        add_header Vary Accept-Encoding;
+    }}
+}}
+"""
+
+
+class Command(BaseCommand):
+    help = 'Export an nginx config that serves collected static files with immutable caching'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Write the config to this file instead of stdout',
+        )
+        parser.add_argument(
+            '--static-root',
+            default=str(settings.STATIC_ROOT),
+            help='STATIC_ROOT path as seen by nginx',
+        )
+        parser.add_argument(
+            '--brotli',
+            action='store_true',
+            help='Serve the .br variants too (requires the ngx_brotli module)',
+        )
+
+    def handle(self, *args, **options):
+        manifest_path = Path(settings.STATIC_ROOT) / 'staticfiles.json'
+        if not manifest_path.is_file():
+            raise CommandError(f"{manifest_path} not found, run collectstatic first")
+
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        hashed_names = list(manifest['paths'].values())
+        unmatched = [name for name in hashed_names if not re.search(HASHED_NAME_PATTERN, name)]
+        if unmatched:
+            raise CommandError(f"Hashed names not matched by {HASHED_NAME_PATTERN}: {', '.join(unmatched[:5])}")
+
+        config = NGINX_TEMPLATE.format(
+            manifest=manifest_path.name,
+            static_url=settings.STATIC_URL,
+            static_root=options['static_root'].rstrip('/'),
+            brotli='    brotli_static on;\n' if options['brotli'] else '',
+            max_age=settings.WHITENOISE_MAX_AGE,
+            hashed_name_pattern=HASHED_NAME_PATTERN,
+            immutable_cache_control=IMMUTABLE_CACHE_CONTROL,
+        )
+
+        if not options['output']:
+            self.stdout.write(config)
+            return
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(config)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {output} ({len(hashed_names)} immutable files)"
+        ))
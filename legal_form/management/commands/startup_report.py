@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_CODE = (
+    "import settings.wsgi\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+
+class Command(BaseCommand):
+    help = 'Report what a worker imports at startup, using python -X importtime'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Number of modules to list',
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write the raw -X importtime log to this file',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - started
+
+        if result.returncode != 0:
+            raise CommandError(result.stderr)
+
+        if options['output']:
+            with open(options['output'], 'w') as log:
+                log.write(result.stderr)
+
+        # Lines look like: "import time:  self [us] | cumulative | imported package"
+        modules = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            modules.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+        top_level = [module for module in modules if not module[2].startswith('  ')]
+        total_us = sum(module[1] for module in top_level)
+
+        self.stdout.write(f"Process startup: {elapsed * 1000:.0f} ms")
+        self.stdout.write(f"Imports: {len(modules)} modules, {total_us / 1000:.0f} ms")
+
+        self.stdout.write("\nSlowest top-level imports (cumulative):")
+        for _, cumulative_us, name in sorted(top_level, reverse=True, key=lambda m: m[1])[:options['top']]:
+            self.stdout.write(f"{cumulative_us / 1000:9.1f} ms  {name.strip()}")
+
+        self.stdout.write("\nSlowest modules (self):")
+        for self_us, _, name in sorted(modules, reverse=True)[:options['top']]:
+            self.stdout.write(f"{self_us / 1000:9.1f} ms  {name.strip()}")
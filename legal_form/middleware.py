@@ -0,0 +1,171 @@
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from .profiling import RequestProfile, activate, deactivate, sql_execute_wrapper
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses larger than RESPONSE_COMPRESSION_MIN_SIZE. JSON API
+    responses use Brotli when the client accepts it; everything else (e.g.
+    admin HTML carrying CSRF tokens) keeps GZipMiddleware's BREACH padding
+    """
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return super().process_response(request, response)
+
+        if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if (
+            brotli is None
+            or content_type != 'application/json'
+            or not re_accepts_brotli.search(accept_encoding)
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        compressed_content = brotli.compress(
+            response.content,
+            quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY,
+        )
+        # Return the uncompressed response if compression doesn't help
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+
+        # Same as GZipMiddleware: the strong ETag no longer matches the bytes
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in per-request profiling of SQL, serializer and Telegram timings.
+    Requests carrying the PROFILING_SECRET in the X-Profile header get them
+    back as a Server-Timing header; requests sampled at PROFILING_SAMPLE_RATE
+    only have them logged. When PROFILING_DUMP_DIR is set, each profiled
+    request also leaves a cProfile dump in a bounded ring
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_SECRET and settings.PROFILING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        if settings.PROFILING_DUMP_MAX_FILES < 1:
+            raise ImproperlyConfigured('PROFILING_DUMP_MAX_FILES must be at least 1')
+        self.get_response = get_response
+
+    def __call__(self, request):
+        requested = self._has_secret_header(request)
+        if not requested and random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = RequestProfile(f'{request.method} {request.path}')
+        token = activate(profile)
+        profiler = self._start_profiler()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sql_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            total = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            profile.finished = True
+            deactivate(token)
+
+        server_timing = profile.server_timing(total)
+        if requested:
+            response.headers['Server-Timing'] = server_timing
+        else:
+            logger.info(f"⏱️ {profile.label}: {server_timing}")
+        if profiler is not None:
+            self._dump_profile(profiler, request)
+        return response
+
+    def _has_secret_header(self, request):
+        secret = settings.PROFILING_SECRET
+        header = request.META.get('HTTP_X_PROFILE')
+        if not secret or not header:
+            return False
+        # WSGI headers are latin-1 decoded; compare the raw bytes
+        return hmac.compare_digest(header.encode('latin-1', 'replace'), secret.encode())
+
+    def _start_profiler(self):
+        if not settings.PROFILING_DUMP_DIR:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return None
+        return profiler
+
+    def _dump_profile(self, profiler, request):
+        # Profiling must never fail the request it observes
+        try:
+            dump_dir = Path(settings.PROFILING_DUMP_DIR)
+            dump_dir.mkdir(parents=True, exist_ok=True)
+
+            slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-')[:60] or 'root'
+            path = dump_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{request.method}-{slug}.pstats"
+            profiler.dump_stats(path)
+
+            self._prune_dumps(dump_dir)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write profile dump for {request.path}: {e}")
+
+    @staticmethod
+    def _prune_dumps(dump_dir):
+        """
+        Keep only the newest PROFILING_DUMP_MAX_FILES dumps
+        """
+        dumps = []
+        for dump in dump_dir.glob('*.pstats'):
+            try:
+                dumps.append((dump.stat().st_mtime, dump))
+            except FileNotFoundError:
+                # Already pruned by a concurrent request
+                continue
+
+        dumps.sort()
+        for _, old_dump in dumps[:max(len(dumps) - settings.PROFILING_DUMP_MAX_FILES, 0)]:
+            old_dump.unlink(missing_ok=True)
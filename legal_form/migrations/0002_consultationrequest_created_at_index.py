@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('legal_form', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='consultationrequest',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -21,7 +21,7 @@ class ConsultationRequest(models.Model):
         verbose_name='Тип услуги'
     )
     comment = models.TextField(blank=True, verbose_name='Комментарий')
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ['-created_at']
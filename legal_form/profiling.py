@@ -0,0 +1,71 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """
+    Timings collected for one profiled request, grouped by name
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.timings = {}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            count, total = self.timings.get(name, (0, 0.0))
+            self.timings[name] = (count + 1, total + seconds)
+
+        # Background work (e.g. Telegram) can outlive the response
+        if self.finished:
+            logger.info(f"⏱️ {self.label}: {name} took {seconds * 1000:.1f} ms after the response")
+
+    def server_timing(self, total_seconds):
+        with self._lock:
+            timings = sorted(self.timings.items())
+
+        parts = [
+            f'{name};dur={total * 1000:.1f};desc="{count} call(s)"'
+            for name, (count, total) in timings
+        ]
+        parts.append(f'total;dur={total_seconds * 1000:.1f}')
+        return ', '.join(parts)
+
+
+def activate(profile):
+    return _current_profile.set(profile)
+
+
+def deactivate(token):
+    _current_profile.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the duration of the block to the active request profile, if any
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+def sql_execute_wrapper(execute, sql, params, many, context):
+    with timed('sql'):
+        return execute(sql, params, many, context)
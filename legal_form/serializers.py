@@ -1,9 +1,79 @@
 from rest_framework import serializers
 
 from legal_form.models import ConsultationRequest
+from legal_form.profiling import timed
 
 
-class ConsultationRequestSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Lets GET/HEAD clients pick fields with ?fields=a,b or drop them with ?omit=c
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+
+        fields = self._split_param(request.query_params.get('fields'))
+        omit = self._split_param(request.query_params.get('omit'))
+
+        unknown = (fields | omit) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': [f"Unknown field(s): {', '.join(sorted(unknown))}"]
+            })
+
+        for field_name in list(self.fields):
+            if (fields and field_name not in fields) or field_name in omit:
+                self.fields.pop(field_name)
+
+    @staticmethod
+    def _split_param(value):
+        if not value:
+            return set()
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    def get_model_field_names(self):
+        """
+        Model columns needed to render the selected fields, for .only();
+        None when a field does not map onto a column
+        """
+        model_fields = {field.attname: field.name for field in self.Meta.model._meta.concrete_fields}
+        model_fields.update({field.name: field.name for field in self.Meta.model._meta.concrete_fields})
+
+        names = set()
+        for field in self.fields.values():
+            source = field.source.split('.')[0]
+            if source.startswith('get_') and source.endswith('_display'):
+                source = source[len('get_'):-len('_display')]
+            if source not in model_fields:
+                return None
+            names.add(model_fields[source])
+        return names
+
+
+class TimedSerializerMixin:
+    """
+    Reports validation and rendering time to the request profile
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with timed('serializer'):
+            return super().is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with timed('serializer'):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+class ConsultationRequestSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
     service_type_display = serializers.CharField(
         source='get_service_type_display',
         read_only=True
@@ -22,6 +92,7 @@ class ConsultationRequestSerializer(serializers.ModelSerializer):
             'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = TimedListSerializer
 
     def validate_phone(self, value):
         # Basic phone validation
@@ -2,6 +2,8 @@ import requests
 import logging
 from django.conf import settings
 
+from .profiling import timed
+
 logger = logging.getLogger(__name__)
 
 CONSULTATION_MESSAGE_TEMPLATE = """🔔 New Request For Consultation!
@@ -40,11 +42,12 @@ class TelegramService:
             logger.debug(f"Payload: {payload}")
             
             # Send request
-            response = requests.post(
-                url, 
-                json=payload,
-                timeout=10
-            )
+            with timed('telegram'):
+                response = requests.post(
+                    url, 
+                    json=payload,
+                    timeout=10
+                )
             
             logger.info(f"Status: {response.status_code}")
             logger.debug(f"Response: {response.text}")
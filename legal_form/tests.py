@@ -0,0 +1,370 @@
+import cProfile
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import brotli
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import views
+from .archive import ConsultationArchiveService
+from .middleware import ProfilingMiddleware
+from .models import ConsultationRequest, ServiceType
+
+
+def create_consultation(created_at=None, **kwargs):
+    fields = {
+        'name': 'Иван Иванов',
+        'email': 'ivan@example.com',
+        'phone': '+998901234567',
+        'service_type': ServiceType.CONTRACTS,
+        'comment': 'Нужна помощь с договором аренды',
+    }
+    fields.update(kwargs)
+    consultation = ConsultationRequest.objects.create(**fields)
+    if created_at is not None:
+        ConsultationRequest.objects.filter(id=consultation.id).update(created_at=created_at)
+    return consultation
+
+
+class ImmediateThread:
+    """
+    Runs the notifier thread's target inline so mocks are still active
+    """
+
+    def __init__(self, target, args=(), **kwargs):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+
+class ConsultationArchiveTests(TestCase):
+
+    def setUp(self):
+        self.archive_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+        settings_override = override_settings(CONSULTATION_ARCHIVE_DIR=str(self.archive_dir / 'archive'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def aware(self, year, month, day):
+        return timezone.make_aware(datetime(year, month, day, 12))
+
+    def test_archive_moves_old_rows_in_chunks(self):
+        for month in (1, 1, 2, 3):
+            create_consultation(created_at=self.aware(2024, month, 10))
+        recent = create_consultation()
+
+        cutoff = timezone.now() - timedelta(days=30)
+        self.assertEqual(ConsultationArchiveService.archive_chunk(cutoff, 3), 3)
+        self.assertEqual(ConsultationArchiveService.archive_chunk(cutoff, 3), 1)
+        self.assertEqual(ConsultationArchiveService.archive_chunk(cutoff, 3), 0)
+
+        self.assertEqual(list(ConsultationRequest.objects.values_list('id', flat=True)), [recent.id])
+        self.assertEqual(
+            sorted(path.name for path in (self.archive_dir / 'archive').iterdir()),
+            [
+                'consultations-2024-01.ndjson.gz',
+                'consultations-2024-02.ndjson.gz',
+                'consultations-2024-03.ndjson.gz',
+            ],
+        )
+
+        rows = list(ConsultationArchiveService.iter_archived())
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['service_type_display'], 'Договоры')
+
+    def test_command_rejects_invalid_arguments(self):
+        create_consultation()
+
+        for arguments in (['--chunk-size', '0'], ['--chunk-size', '-1'], ['--older-than-days', '-1']):
+            with self.assertRaises(CommandError):
+                call_command('archive_consultations', *arguments)
+
+        self.assertEqual(ConsultationRequest.objects.count(), 1)
+
+    def test_read_path_deduplicates_rows(self):
+        create_consultation(created_at=self.aware(2024, 1, 10))
+        ConsultationArchiveService.archive_chunk(timezone.now(), 10)
+
+        # A crash between writing and deleting leaves the row archived twice
+        path = ConsultationArchiveService.archive_path(2024, 1)
+        path.write_bytes(path.read_bytes() * 2)
+
+        self.assertEqual(len(list(ConsultationArchiveService.iter_archived())), 1)
+
+    def test_read_path_skips_files_outside_range(self):
+        create_consultation(created_at=self.aware(2024, 2, 10), name='February')
+        ConsultationArchiveService.archive_chunk(timezone.now(), 10)
+
+        # Unreadable files outside the range must not be opened
+        ConsultationArchiveService.archive_path(2024, 1).write_bytes(b'not gzip')
+        ConsultationArchiveService.archive_path(2024, 3).write_bytes(b'not gzip')
+
+        rows = list(ConsultationArchiveService.iter_archived(
+            start=self.aware(2024, 2, 1),
+            end=self.aware(2024, 2, 28),
+        ))
+        self.assertEqual([row['name'] for row in rows], ['February'])
+
+        with self.assertRaises(gzip.BadGzipFile):
+            list(ConsultationArchiveService.iter_archived())
+
+    def test_read_path_without_archive_dir(self):
+        self.assertEqual(list(ConsultationArchiveService.iter_archived()), [])
+        self.assertFalse((self.archive_dir / 'archive').exists())
+
+    def test_archive_endpoint_is_staff_only_and_capped(self):
+        for day in range(1, 4):
+            create_consultation(created_at=self.aware(2024, 1, day))
+        ConsultationArchiveService.archive_chunk(timezone.now(), 10)
+
+        client = APIClient()
+        self.assertEqual(client.get('/api/consultation/archive/').status_code, 403)
+
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        client.force_authenticate(admin)
+        with mock.patch.object(views, 'ARCHIVE_MAX_LIMIT', 2):
+            response = client.get('/api/consultation/archive/?limit=1000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+
+class SparseFieldsTests(TestCase):
+
+    def setUp(self):
+        create_consultation()
+        self.client = APIClient()
+
+    def get_list(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/consultation/list/{query}', HTTP_ACCEPT='application/json')
+        return response, queries.captured_queries[-1]['sql']
+
+    def test_fields_narrows_response_and_select(self):
+        response, sql = self.get_list('?fields=id,name,service_type,created_at')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.json()[0]), ['created_at', 'id', 'name', 'service_type'])
+        self.assertNotIn('"comment"', sql)
+        self.assertNotIn('"email"', sql)
+
+    def test_omit_drops_fields_and_columns(self):
+        response, sql = self.get_list('?omit=comment')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('comment', response.json()[0])
+        self.assertIn('service_type_display', response.json()[0])
+        self.assertNotIn('"comment"', sql)
+
+    def test_display_field_selects_its_column(self):
+        response, sql = self.get_list('?fields=service_type_display')
+
+        self.assertEqual(response.json()[0], {'service_type_display': 'Договоры'})
+        self.assertIn('"service_type"', sql)
+        self.assertNotIn('"name"', sql)
+
+    def test_unknown_field_is_rejected(self):
+        for query in ('?fields=bogus', '?omit=id,bogus'):
+            response = self.client.get(f'/api/consultation/list/{query}', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('bogus', response.json()['fields'][0])
+
+    def test_head_is_validated_like_get(self):
+        response = self.client.head('/api/consultation/list/?fields=bogus')
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch.object(views, 'TelegramService')
+    def test_create_ignores_fields_param(self, telegram_service):
+        with mock.patch.object(views.threading, 'Thread', ImmediateThread):
+            response = self.client.post('/api/consultation/?fields=id', {
+                'name': 'Петр Петров',
+                'email': 'petr@example.com',
+                'phone': '+998907654321',
+                'service_type': ServiceType.COURT_DISPUTES,
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        telegram_service.send_consultation_request.assert_called_once()
+        self.assertIn('name', response.json())
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(TestCase):
+
+    def setUp(self):
+        for _ in range(20):
+            create_consultation(comment='Нужна помощь с договором аренды ' * 10)
+
+    def get_list(self, accept_encoding):
+        return self.client.get(
+            '/api/consultation/list/',
+            HTTP_ACCEPT='application/json',
+            HTTP_ACCEPT_ENCODING=accept_encoding,
+        )
+
+    def test_json_uses_brotli_when_accepted(self):
+        response = self.get_list('gzip, deflate, br')
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(brotli.decompress(response.content)), len(self.get_list('').content))
+
+    def test_falls_back_to_gzip(self):
+        response = self.get_list('gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        gzip.decompress(response.content)
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get('/api/service-types/', HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='br')
+
+        self.assertLess(len(response.content), 1024)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_html_keeps_padded_gzip(self):
+        response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='br, gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+@override_settings(PROFILING_SECRET='s3cret', PROFILING_SAMPLE_RATE=0)
+class ProfilingMiddlewareTests(TestCase):
+
+    def setUp(self):
+        create_consultation()
+
+    def test_secret_header_returns_server_timing(self):
+        response = self.client.get('/api/consultation/list/', HTTP_X_PROFILE='s3cret')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('sql;dur=', response['Server-Timing'])
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+
+    def test_wrong_or_non_ascii_header_is_ignored(self):
+        for header in ('wrong', '\xe9'):
+            response = self.client.get('/api/consultation/list/', HTTP_X_PROFILE=header)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(PROFILING_SECRET='', PROFILING_SAMPLE_RATE=1)
+    def test_sampled_requests_only_log_timings(self):
+        with self.assertLogs('legal_form.middleware', 'INFO') as logs:
+            response = self.client.get('/api/consultation/list/')
+
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertIn('sql;dur=', logs.output[0])
+
+    def test_dump_ring_is_bounded(self):
+        dump_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, dump_dir, ignore_errors=True)
+
+        with override_settings(PROFILING_DUMP_DIR=str(dump_dir), PROFILING_DUMP_MAX_FILES=1):
+            for path in ('/api/consultation/list/', '/api/service-types/'):
+                self.client.get(path, HTTP_X_PROFILE='s3cret')
+
+        self.assertEqual([dump.name.split('-', 3)[3] for dump in dump_dir.glob('*.pstats')], ['GET-api-service-types.pstats'])
+
+    def dump_profile(self):
+        middleware = ProfilingMiddleware(lambda request: HttpResponse())
+        middleware._dump_profile(cProfile.Profile(), RequestFactory().get('/api/service-types/'))
+
+    def test_dump_tolerates_files_removed_concurrently(self):
+        dump_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, dump_dir, ignore_errors=True)
+        (dump_dir / 'old.pstats').write_bytes(b'')
+        vanished = dump_dir / 'vanished.pstats'
+        original_glob = Path.glob
+
+        def glob_with_vanished_file(path, pattern):
+            return [*original_glob(path, pattern), vanished]
+
+        with override_settings(PROFILING_DUMP_DIR=str(dump_dir), PROFILING_DUMP_MAX_FILES=1):
+            with mock.patch.object(Path, 'glob', glob_with_vanished_file):
+                self.dump_profile()
+
+        self.assertEqual(len(list(dump_dir.glob('*.pstats'))), 1)
+        self.assertFalse((dump_dir / 'old.pstats').exists())
+
+    def test_dump_errors_are_logged_not_raised(self):
+        dump_file = Path(tempfile.mkstemp()[1])
+        self.addCleanup(dump_file.unlink, missing_ok=True)
+
+        # A regular file where the dump directory should be
+        with override_settings(PROFILING_DUMP_DIR=str(dump_file)):
+            with self.assertLogs('legal_form.middleware', 'WARNING'):
+                self.dump_profile()
+
+
+class ExportStaticNginxTests(TestCase):
+
+    def setUp(self):
+        self.static_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        settings_override = override_settings(STATIC_ROOT=str(self.static_root))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write_manifest(self, paths):
+        manifest = {'paths': paths, 'version': '1.1'}
+        (self.static_root / 'staticfiles.json').write_text(json.dumps(manifest))
+
+    def export(self, *arguments):
+        stdout = StringIO()
+        call_command('export_static_nginx', '--static-root', '/app/staticfiles', *arguments, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_exports_immutable_location(self):
+        self.write_manifest({
+            'admin/css/base.css': 'admin/css/base.6be58084bde8.css',
+            'drf_spectacular_sidecar/swagger-ui-dist/LICENSE': 'drf_spectacular_sidecar/swagger-ui-dist/LICENSE.3b83ef96387f',
+        })
+
+        config = self.export()
+
+        self.assertIn('location ^~ /static/ {', config)
+        self.assertIn('alias /app/staticfiles/;', config)
+        self.assertIn('gzip_static on;', config)
+        self.assertIn('immutable', config)
+        self.assertNotIn('brotli_static', config)
+
+    def test_brotli_is_opt_in(self):
+        self.write_manifest({'admin/css/base.css': 'admin/css/base.6be58084bde8.css'})
+
+        self.assertIn('brotli_static on;', self.export('--brotli'))
+
+    def test_writes_output_file(self):
+        self.write_manifest({'admin/css/base.css': 'admin/css/base.6be58084bde8.css'})
+        output = self.static_root / 'nginx' / 'static.conf'
+
+        self.export('--output', str(output))
+
+        self.assertIn('gzip_static on;', output.read_text())
+
+    def test_missing_manifest(self):
+        with self.assertRaisesMessage(CommandError, 'run collectstatic first'):
+            self.export()
+
+    def test_unmatched_hashed_name(self):
+        self.write_manifest({'admin/css/base.css': 'admin/css/base.css'})
+
+        with self.assertRaisesMessage(CommandError, 'admin/css/base.css'):
+            self.export()
@@ -4,5 +4,6 @@ from . import views
 urlpatterns = [
     path('api/consultation/', views.ConsultationRequestCreateView.as_view(), name='create_consultation'),
     path('api/consultation/list/', views.ConsultationRequestListView.as_view(), name='list_consultations'),
+    path('api/consultation/archive/', views.ConsultationArchiveListView.as_view(), name='archived_consultations'),
     path('api/service-types/', views.ServiceTypeListView.as_view(), name='service_types'),
 ]
\ No newline at end of file
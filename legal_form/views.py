@@ -1,18 +1,25 @@
 # views.py
-from rest_framework import status, generics
+from rest_framework import status, generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema, OpenApiExample
-from drf_spectacular.types import OpenApiTypes
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from datetime import datetime, time
+from itertools import islice
+import contextvars
 import threading
 import logging
 
+from .archive import ConsultationArchiveService
 from .models import ConsultationRequest, ServiceType
+from .schema import extend_schema, OpenApiExample, OpenApiParameter, OpenApiTypes
 from .serializers import ConsultationRequestSerializer
 from .services import TelegramService
 
 logger = logging.getLogger(__name__)
 
+ARCHIVE_MAX_LIMIT = 500
+
 
 @extend_schema(
     tags=['Consultation'],
@@ -72,7 +79,8 @@ class ConsultationRequestCreateView(generics.CreateAPIView):
             except Exception as e:
                 logger.error(f"Failed to send Telegram for consultation {consultation.id}: {e}")
 
-        thread = threading.Thread(target=send_telegram)
+        # Copy the context so Telegram timings reach the request profile
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(send_telegram,))
         thread.daemon = True
         thread.start()
 
@@ -128,6 +136,10 @@ class ServiceTypeListView(APIView):
     tags=['Consultation'],
     summary='List consultation requests',
     description='Get paginated list of all consultation requests',
+    parameters=[
+        OpenApiParameter('fields', OpenApiTypes.STR, description='Comma-separated fields to return, e.g. id,name,service_type,created_at'),
+        OpenApiParameter('omit', OpenApiTypes.STR, description='Comma-separated fields to leave out, e.g. comment'),
+    ],
     responses={
         200: ConsultationRequestSerializer(many=True),
     },
@@ -167,6 +179,72 @@ class ConsultationRequestListView(generics.ListAPIView):
     GET /api/consultation/list/
     - Returns paginated list of consultation requests
     - Ordered by creation date (newest first)
+    - ?fields= / ?omit= narrow both the response and the SELECT
     """
     queryset = ConsultationRequest.objects.all().order_by('-created_at')
     serializer_class = ConsultationRequestSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        model_field_names = self.get_serializer().get_model_field_names()
+        if model_field_names:
+            queryset = queryset.only(*model_field_names)
+        return queryset
+
+
+@extend_schema(
+    tags=['Consultation'],
+    summary='Search archived consultation requests',
+    description='Query consultation requests moved out of the main table by the archive_consultations command',
+    parameters=[
+        OpenApiParameter('date_from', OpenApiTypes.DATE, description='Created on or after (YYYY-MM-DD)'),
+        OpenApiParameter('date_to', OpenApiTypes.DATE, description='Created before (YYYY-MM-DD)'),
+        OpenApiParameter('service_type', OpenApiTypes.STR, enum=ServiceType.values),
+        OpenApiParameter('search', OpenApiTypes.STR, description='Substring of name, email, phone or comment'),
+        OpenApiParameter('limit', OpenApiTypes.INT, description=f'Maximum number of results (default 100, at most {ARCHIVE_MAX_LIMIT})'),
+    ],
+    responses={
+        200: ConsultationRequestSerializer(many=True),
+        400: OpenApiTypes.OBJECT,
+        403: OpenApiTypes.OBJECT,
+    },
+)
+class ConsultationArchiveListView(APIView):
+    """
+    Search archived consultation requests
+
+    GET /api/consultation/archive/
+    - Staff only: archived rows contain contact details
+    - Reads only the monthly archive files that overlap the date range
+    - Ordered by month (newest first)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            start = self._parse_day(params.get('date_from'))
+            end = self._parse_day(params.get('date_to'))
+            limit = int(params.get('limit', 100))
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date_from, date_to or limit'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = ConsultationArchiveService.iter_archived(
+            start=start,
+            end=end,
+            service_type=params.get('service_type'),
+            search=params.get('search'),
+        )
+        return Response(list(islice(rows, min(max(limit, 0), ARCHIVE_MAX_LIMIT))))
+
+    @staticmethod
+    def _parse_day(value):
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,22 @@
+import os
+
+bind = '0.0.0.0:8000'
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = 60
+accesslog = '-'
+errorlog = '-'
+loglevel = 'info'
+
+# Import Django once in the master; workers share it copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+
+def when_ready(server):
+    """
+    Resolve the URLconf in the master so views, serializers and admin
+    are imported before the workers fork instead of on their first request
+    """
+    if preload_app:
+        from django.urls import get_resolver
+        get_resolver().url_patterns
@@ -0,0 +1,17 @@
+import logging
+from pathlib import Path
+
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    FileHandler that creates the log directory on its first write instead
+    of at settings import time
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        kwargs['delay'] = True
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
@@ -1,13 +1,14 @@
 import os
-from django.conf.urls.static import static
-from dotenv import load_dotenv
 from pathlib import Path
 
-load_dotenv()
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Local development reads .env; containers get their environment from compose
+if (BASE_DIR / '.env').is_file():
+    from dotenv import load_dotenv
+    load_dotenv(BASE_DIR / '.env')
+
 # SECURITY WARNING
 SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-change-this-key-in-production-#$%^&*()_+-=[]{}|;:,.<>?')
 
@@ -16,6 +17,9 @@ DEBUG = os.getenv('DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = ['*']
 
+# Swagger / Redoc and the OpenAPI schema; disable to skip loading them at startup
+API_DOCS_ENABLED = os.getenv('API_DOCS_ENABLED', 'True') == 'True'
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -27,16 +31,26 @@ INSTALLED_APPS = [
     # Third party apps
     'rest_framework',
     'corsheaders',
-    'drf_spectacular',
-    'drf_spectacular_sidecar',
 
     # Local apps
     'legal_form',
 ]
 
+if API_DOCS_ENABLED:
+    INSTALLED_APPS += [
+        'drf_spectacular',
+        'drf_spectacular_sidecar',
+    ]
+
+# Serve /static/ from the app with WhiteNoise; set to False when nginx serves
+# STATIC_ROOT using the config from `manage.py export_static_nginx`
+SERVE_STATIC = os.getenv('SERVE_STATIC', 'True') == 'True'
+
 MIDDLEWARE = [
+    'legal_form.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'legal_form.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,6 +60,21 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if not SERVE_STATIC:
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
+# Negotiated br/gzip for API responses; small bodies aren't worth the CPU
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', '1024'))
+RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.getenv('RESPONSE_COMPRESSION_BROTLI_QUALITY', '5'))
+
+# Per-request profiling (Server-Timing header), off unless a secret or sample rate is set.
+# Send `X-Profile: <PROFILING_SECRET>` to profile a single request.
+PROFILING_SECRET = os.getenv('PROFILING_SECRET', '')
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+# Directory for cProfile .pstats dumps of profiled requests; empty disables dumps
+PROFILING_DUMP_DIR = os.getenv('PROFILING_DUMP_DIR', '')
+PROFILING_DUMP_MAX_FILES = int(os.getenv('PROFILING_DUMP_MAX_FILES', '50'))
+
 ROOT_URLCONF = 'settings.urls'
 
 TEMPLATES = [
@@ -69,12 +98,12 @@ WSGI_APPLICATION = 'settings.wsgi.application'
 
 # Database
 # Support both MySQL and SQLite
-import pymysql
-pymysql.install_as_MySQLdb()
-
 DATABASE_ENGINE = os.getenv('DATABASE_ENGINE', 'django.db.backends.sqlite3')
 
 if DATABASE_ENGINE == 'django.db.backends.mysql':
+    import pymysql
+    pymysql.install_as_MySQLdb()
+
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.mysql',
@@ -146,6 +175,10 @@ STORAGES = {
     },
 }
 
+# collectstatic writes hashed names plus .gz/.br variants; hashed files are
+# served with a ten-year immutable Cache-Control, everything else with this
+WHITENOISE_MAX_AGE = int(os.getenv('WHITENOISE_MAX_AGE', '3600'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -163,9 +196,11 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+if API_DOCS_ENABLED:
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'drf_spectacular.openapi.AutoSchema'
+
 # DRF Spectacular Configuration (API Documentation)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Legal Consultation API',
@@ -199,6 +234,11 @@ CSRF_TRUSTED_ORIGINS = [
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
 TELEGRAM_CHAT_IDS = os.getenv('TELEGRAM_CHAT_IDS', '-1003109762472')
 
+# Consultation retention - older rows are moved to gzip NDJSON archives
+CONSULTATION_RETENTION_DAYS = int(os.getenv('CONSULTATION_RETENTION_DAYS', '365'))
+CONSULTATION_ARCHIVE_CHUNK_SIZE = int(os.getenv('CONSULTATION_ARCHIVE_CHUNK_SIZE', '500'))
+CONSULTATION_ARCHIVE_DIR = os.getenv('CONSULTATION_ARCHIVE_DIR', str(BASE_DIR / 'archive'))
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -215,7 +255,7 @@ LOGGING = {
             'formatter': 'verbose',
         },
         'file': {
-            'class': 'logging.FileHandler',
+            'class': 'settings.log_handlers.LazyFileHandler',
             'filename': BASE_DIR / 'logs' / 'django.log',
             'formatter': 'verbose',
         },
@@ -238,9 +278,6 @@ LOGGING = {
     },
 }
 
-LOGS_DIR = BASE_DIR / 'logs'
-LOGS_DIR.mkdir(exist_ok=True)
-
 SECURE_SSL_REDIRECT = False
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SESSION_COOKIE_SECURE = False